@@ -73,13 +73,18 @@ class Calibration(abc.Mapping):
 
     def _compute_metric_dict(self, metrics: v2.metrics_pb2.MetricsSnapshot) -> ALL_METRICS:
         results: ALL_METRICS = defaultdict(dict)
+        # The same targets appear in many metrics, so parse each one only once.
+        keys: Dict[str, Union[cirq.GridQubit, str]] = {}
         for metric in metrics:
             name = metric.name
             # Flatten the values to a list, removing keys containing type names
             # (e.g. proto version of each value is {<type>: value}).
             flat_values = [getattr(v, v.WhichOneof('val')) for v in metric.values]
             if metric.targets:
-                qubits = tuple(self.str_to_key(t) for t in metric.targets)
+                for t in metric.targets:
+                    if t not in keys:
+                        keys[t] = self.str_to_key(t)
+                qubits = tuple(keys[t] for t in metric.targets)
                 results[name][qubits] = flat_values
             else:
                 assert len(results[name]) == 0, (
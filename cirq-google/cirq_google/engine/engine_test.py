@@ -14,6 +14,8 @@
 
 """Tests for engine."""
 import datetime
+import pathlib
+from typing import List, Type, TypeVar
 from unittest import mock
 import time
 import numpy as np
@@ -21,6 +23,7 @@ import pytest
 
 import duet
 from google.protobuf import any_pb2, timestamp_pb2
+from google.protobuf.message import Message
 from google.protobuf.text_format import Merge
 
 import cirq
@@ -40,226 +43,129 @@ _CIRCUIT2 = cirq.FrozenCircuit(
     cirq.Y(cirq.GridQubit(5, 2)) ** 0.5, cirq.measure(cirq.GridQubit(5, 2), key='result')
 )
 
+_CAL_Q1 = cirq.GridQubit(2, 3)
+_CAL_Q2 = cirq.GridQubit(2, 4)
+_CALIBRATION_LAYERS = [
+    cg.CalibrationLayer('xeb', cirq.Circuit(cirq.CZ(_CAL_Q1, _CAL_Q2)), {'num_layers': 42}),
+    cg.CalibrationLayer(
+        'readout', cirq.Circuit(cirq.measure(_CAL_Q1, _CAL_Q2)), {'num_samples': 4242}
+    ),
+]
 
-def _to_timestamp(json_string):
-    timestamp_proto = timestamp_pb2.Timestamp()
-    timestamp_proto.FromJsonString(json_string)
-    return timestamp_proto
-
-
-_A_RESULT = util.pack_any(
-    Merge(
-        """
-sweep_results: [{
-        repetitions: 1,
-        measurement_keys: [{
-            key: 'q',
-            qubits: [{
-                row: 1,
-                col: 1
-            }]
-        }],
-        parameterized_results: [{
-            params: {
-                assignments: {
-                    key: 'a'
-                    value: 1
-                }
-            },
-            measurement_results: '\000\001'
-        }]
-    }]
-""",
-        v1.program_pb2.Result(),
+# Run contexts expected for a single run with one repetition and for calibrations.
+_SINGLE_RUN_CONTEXT = util.pack_any(
+    v2.run_context_pb2.RunContext(
+        parameter_sweeps=[v2.run_context_pb2.ParameterSweep(repetitions=1)]
     )
 )
+_EMPTY_RUN_CONTEXT = util.pack_any(v2.run_context_pb2.RunContext())
 
-_RESULTS = util.pack_any(
-    Merge(
-        """
-sweep_results: [{
-        repetitions: 1,
-        measurement_keys: [{
-            key: 'q',
-            qubits: [{
-                row: 1,
-                col: 1
-            }]
-        }],
-        parameterized_results: [{
-            params: {
-                assignments: {
-                    key: 'a'
-                    value: 1
-                }
-            },
-            measurement_results: '\000\001'
-        },{
-            params: {
-                assignments: {
-                    key: 'a'
-                    value: 2
-                }
-            },
-            measurement_results: '\000\001'
-        }]
-    }]
-""",
-        v1.program_pb2.Result(),
-    )
-)
+# Measurement of qubit 'q' expected from every result fixture.
+_MEASUREMENT = np.zeros((1, 1), dtype=np.uint8)
 
-_RESULTS_V2 = util.pack_any(
-    Merge(
-        """
-sweep_results: [{
-        repetitions: 1,
-        parameterized_results: [{
-            params: {
-                assignments: {
-                    key: 'a'
-                    value: 1
-                }
-            },
-            measurement_results: {
-                key: 'q'
-                qubit_measurement_results: [{
-                  qubit: {
-                    id: '1_1'
-                  }
-                  results: '\000\001'
-                }]
-            }
-        },{
-            params: {
-                assignments: {
-                    key: 'a'
-                    value: 2
-                }
-            },
-            measurement_results: {
-                key: 'q'
-                qubit_measurement_results: [{
-                  qubit: {
-                    id: '1_1'
-                  }
-                  results: '\000\001'
-                }]
-            }
-        }]
-    }]
-""",
-        v2.result_pb2.Result(),
-    )
-)
 
-_BATCH_RESULTS_V2 = util.pack_any(
-    Merge(
-        """
-results: [{
-    sweep_results: [{
-        repetitions: 1,
-        parameterized_results: [{
-            params: {
-                assignments: {
-                    key: 'a'
-                    value: 1
-                }
-            },
-            measurement_results: {
-                key: 'q'
-                qubit_measurement_results: [{
-                  qubit: {
-                    id: '1_1'
-                  }
-                  results: '\000\001'
-                }]
-            }
-        },{
-            params: {
-                assignments: {
-                    key: 'a'
-                    value: 2
-                }
-            },
-            measurement_results: {
-                key: 'q'
-                qubit_measurement_results: [{
-                  qubit: {
-                    id: '1_1'
-                  }
-                  results: '\000\001'
-                }]
-            }
-        }]
-    }],
-    },{
-    sweep_results: [{
-        repetitions: 1,
-        parameterized_results: [{
-            params: {
-                assignments: {
-                    key: 'a'
-                    value: 3
-                }
-            },
-            measurement_results: {
-                key: 'q'
-                qubit_measurement_results: [{
-                  qubit: {
-                    id: '1_1'
-                  }
-                  results: '\000\001'
-                }]
-            }
-        },{
-            params: {
-                assignments: {
-                    key: 'a'
-                    value: 4
-                }
-            },
-            measurement_results: {
-                key: 'q'
-                qubit_measurement_results: [{
-                  qubit: {
-                    id: '1_1'
-                  }
-                  results: '\000\001'
-                }]
-            }
-        }]
-    }]
-}]
-""",
-        v2.batch_pb2.BatchResult(),
-    )
-)
+M = TypeVar('M', bound=Message)
+
+_TEST_DATA_DIR = pathlib.Path(__file__).parent / 'test_data'
+
+
+def _any_from_bytes(type_url: str, payload: bytes) -> any_pb2.Any:
+    """Wraps an already serialized message in an Any without parsing it."""
+    packed = any_pb2.Any()
+    packed.type_url = type_url
+    packed.value = payload
+    return packed
+
+
+# Type URLs of the binary fixtures, spelled out so loading them needs no
+# descriptor lookup. test_binary_test_data_matches_textproto checks them.
+_V1_RESULT_TYPE_URL = 'type.googleapis.com/cirq.google.api.v1.Result'
+_DEVICE_SPEC_TYPE_URL = 'type.googleapis.com/cirq.google.api.v2.DeviceSpecification'
+_METRICS_SNAPSHOT_TYPE_URL = 'type.googleapis.com/cirq.google.api.v2.MetricsSnapshot'
+
+
+def _load_any(name: str, type_url: str) -> any_pb2.Any:
+    """Loads a binary proto fixture from test_data as an Any.
+
+    The fixtures are generated from the matching .textproto files by
+    dev_tools/generate_engine_test_data.py. The file already holds the
+    serialized message, so it becomes the Any's value directly instead of
+    being parsed and then serialized again by Any.Pack.
+    """
+    return _any_from_bytes(type_url, (_TEST_DATA_DIR / f'{name}.pb').read_bytes())
+
+
+@pytest.fixture(scope='session')
+def a_result() -> any_pb2.Any:
+    return _load_any('a_result', _V1_RESULT_TYPE_URL)
+
+
+@pytest.fixture(scope='session')
+def results_v1() -> any_pb2.Any:
+    return _load_any('results', _V1_RESULT_TYPE_URL)
+
+
+def _parse_any(packed: any_pb2.Any, message_type: Type[M]) -> M:
+    """Checks that an Any holds a `message_type` and parses its payload."""
+    assert packed.Is(message_type.DESCRIPTOR)
+    return message_type.FromString(packed.value)
+
+
+def _add_sweep_result_v2(sweep_result: v2.result_pb2.SweepResult, values: List[int]) -> None:
+    """Fills in a one-repetition sweep over 'a' that measures qubit 1_1 as 'q'."""
+    sweep_result.repetitions = 1
+    for value in values:
+        parameterized_result = sweep_result.parameterized_results.add()
+        parameterized_result.params.assignments['a'] = value
+        measurement_result = parameterized_result.measurement_results.add()
+        measurement_result.key = 'q'
+        qubit_result = measurement_result.qubit_measurement_results.add()
+        qubit_result.qubit.id = '1_1'
+        qubit_result.results = b'\000\001'
+
+
+@pytest.fixture(scope='session')
+def results_v2() -> any_pb2.Any:
+    result = v2.result_pb2.Result()
+    _add_sweep_result_v2(result.sweep_results.add(), [1, 2])
+    return util.pack_any(result)
+
 
+@pytest.fixture(scope='session')
+def batch_results_v2() -> any_pb2.Any:
+    batch_result = v2.batch_pb2.BatchResult()
+    _add_sweep_result_v2(batch_result.results.add().sweep_results.add(), [1, 2])
+    _add_sweep_result_v2(batch_result.results.add().sweep_results.add(), [3, 4])
+    return util.pack_any(batch_result)
 
-_CALIBRATION_RESULTS_V2 = util.pack_any(
-    Merge(
-        """
-results: [{
-    code: 1
-    error_message: 'First success'
-    token: 'abc123'
-    metrics: {
-      metrics: [{
-        name: 'fidelity'
-        targets: ['q2_3','q2_4']
-        values: [{
-            double_val: 0.75
-    }]
-    }]}
-    },{
-    code: 1
-    error_message: 'Second success'
-}]
-""",
-        v2.calibration_pb2.FocusedCalibrationResult(),
+
+@pytest.fixture(scope='session')
+def calibration_results_v2() -> any_pb2.Any:
+    calibration_result = v2.calibration_pb2.FocusedCalibrationResult()
+    first = calibration_result.results.add(
+        code=v2.calibration_pb2.SUCCESS, error_message='First success', token='abc123'
     )
+    metric = first.metrics.metrics.add(name='fidelity', targets=['q2_3', 'q2_4'])
+    metric.values.add(double_val=0.75)
+    calibration_result.results.add(code=v2.calibration_pb2.SUCCESS, error_message='Second success')
+    return util.pack_any(calibration_result)
+
+
+@pytest.mark.parametrize(
+    'name, message_type, type_url',
+    [
+        ('a_result', v1.program_pb2.Result, _V1_RESULT_TYPE_URL),
+        ('results', v1.program_pb2.Result, _V1_RESULT_TYPE_URL),
+        ('device_spec', v2.device_pb2.DeviceSpecification, _DEVICE_SPEC_TYPE_URL),
+        ('metrics_snapshot', v2.metrics_pb2.MetricsSnapshot, _METRICS_SNAPSHOT_TYPE_URL),
+    ],
+    ids=['a_result', 'results', 'device_spec', 'metrics_snapshot'],
 )
+def test_binary_test_data_matches_textproto(name, message_type, type_url):
+    expected = Merge((_TEST_DATA_DIR / f'{name}.textproto').read_text(), message_type())
+    actual = message_type.FromString((_TEST_DATA_DIR / f'{name}.pb').read_bytes())
+    assert actual == expected
+    assert _load_any(name, type_url) == util.pack_any(expected)
 
 
 def test_make_random_id():
@@ -283,8 +189,30 @@ def mock_grpc_client_async():
         yield _fixture
 
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient')
-def test_create_context(client):
+@pytest.fixture(scope='module')
+def engine(mock_grpc_client_async):
+    """An Engine with default settings shared by tests that never reach the EngineClient."""
+    return cg.Engine(project_id='proj')
+
+
+@pytest.fixture(scope='module')
+def v2_engine(mock_grpc_client_async):
+    """A V2 Engine shared by tests that never reach the EngineClient.
+
+    An Engine binds its client when it is constructed, so tests that assert on
+    calls to a patched EngineClient must still create their own Engine.
+    """
+    return cg.Engine(project_id='proj', proto_version=cg.engine.engine.ProtoVersion.V2)
+
+
+@pytest.fixture
+def engine_client():
+    """Patches EngineClient with an autospec mock for the duration of one test."""
+    with mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True) as _fixture:
+        yield _fixture
+
+
+def test_create_context(engine_client):
     with pytest.raises(ValueError, match='specify service_args and verbose or client'):
         EngineContext(cg.engine.engine.ProtoVersion.V1, {'args': 'test'}, True, mock.Mock())
     with pytest.raises(ValueError, match='no longer supported'):
@@ -292,15 +220,15 @@ def test_create_context(client):
 
     context = EngineContext(cg.engine.engine.ProtoVersion.V2, {'args': 'test'}, True)
     assert context.proto_version == cg.engine.engine.ProtoVersion.V2
-    assert client.called_with({'args': 'test'}, True)
+    engine_client.assert_called_with({'args': 'test'}, True)
 
-    assert context.copy().proto_version == context.proto_version
-    assert context.copy().client == context.client
-    assert context.copy() == context
+    context_copy = context.copy()
+    assert context_copy.proto_version == context.proto_version
+    assert context_copy.client == context.client
+    assert context_copy == context
 
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True)
-def test_create_engine(client):
+def test_create_engine(engine_client):
     with pytest.raises(
         ValueError, match='provide context or proto_version, service_args and verbose'
     ):
@@ -321,7 +249,7 @@ def test_create_engine(client):
         ).context.proto_version
         == cg.engine.engine.ProtoVersion.V2
     )
-    client.assert_called_with({'args': 'test'}, True)
+    engine_client.assert_called_with({'args': 'test'}, True)
 
 
 def test_engine_str():
@@ -332,31 +260,33 @@ def test_engine_str():
 
 
 _DT = datetime.datetime.now(tz=datetime.timezone.utc)
+_JOB_NAME = 'projects/proj/programs/prog/jobs/job-id'
+
+
+def _job(state, **extra):
+    return quantum.QuantumJob(name=_JOB_NAME, execution_status={'state': state, **extra})
+
+
+# The mocked client hands out these messages by reference, and the engine never
+# mutates them, so every test can share the same instances.
+_PROGRAM = quantum.QuantumProgram(name='projects/proj/programs/prog')
+_READY_JOB = _job('READY')
+_SUCCESS_JOB = quantum.QuantumJob(execution_status={'state': 'SUCCESS'}, update_time=_DT)
 
 
 def setup_run_circuit_with_result_(client, result):
-    client().create_program_async.return_value = (
-        'prog',
-        quantum.QuantumProgram(name='projects/proj/programs/prog'),
-    )
-    client().create_job_async.return_value = (
-        'job-id',
-        quantum.QuantumJob(
-            name='projects/proj/programs/prog/jobs/job-id', execution_status={'state': 'READY'}
-        ),
-    )
-    client().get_job_async.return_value = quantum.QuantumJob(
-        execution_status={'state': 'SUCCESS'}, update_time=_DT
-    )
-    client().get_job_results_async.return_value = quantum.QuantumResult(result=result)
+    client().create_program_async.return_value = ('prog', _PROGRAM)
+    client().create_job_async.return_value = ('job-id', _READY_JOB)
+    client().get_job_async.return_value = _SUCCESS_JOB
+    quantum_result = quantum.QuantumResult(result=result)
+    client().get_job_results_async.return_value = quantum_result
     stream_future = duet.AwaitableFuture()
-    stream_future.try_set_result(quantum.QuantumResult(result=result))
+    stream_future.try_set_result(quantum_result)
     client().run_job_over_stream.return_value = stream_future
 
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True)
-def test_run_circuit(client):
-    setup_run_circuit_with_result_(client, _A_RESULT)
+def test_run_circuit(engine_client, a_result):
+    setup_run_circuit_with_result_(engine_client, a_result)
 
     engine = cg.Engine(project_id='proj', service_args={'client_info': 1})
     result = engine.run(
@@ -365,19 +295,15 @@ def test_run_circuit(client):
 
     assert result.repetitions == 1
     assert result.params.param_dict == {'a': 1}
-    assert result.measurements == {'q': np.array([[0]], dtype='uint8')}
-    client.assert_called_with(service_args={'client_info': 1}, verbose=None)
-    client().run_job_over_stream.assert_called_once_with(
+    assert result.measurements == {'q': _MEASUREMENT}
+    engine_client.assert_called_with(service_args={'client_info': 1}, verbose=None)
+    engine_client().run_job_over_stream.assert_called_once_with(
         project_id='proj',
         program_id='prog',
         code=mock.ANY,
         job_id='job-id',
         processor_ids=['mysim'],
-        run_context=util.pack_any(
-            v2.run_context_pb2.RunContext(
-                parameter_sweeps=[v2.run_context_pb2.ParameterSweep(repetitions=1)]
-            )
-        ),
+        run_context=_SINGLE_RUN_CONTEXT,
         program_description=None,
         program_labels=None,
         job_description=None,
@@ -385,81 +311,46 @@ def test_run_circuit(client):
     )
 
 
-def test_no_gate_set():
-    engine = cg.Engine(project_id='project-id')
+def test_no_gate_set(engine):
     assert engine.context.serializer == cg.CIRCUIT_SERIALIZER
 
 
-def test_unsupported_program_type():
-    engine = cg.Engine(project_id='project-id')
+def test_unsupported_program_type(engine):
     with pytest.raises(TypeError, match='program'):
         engine.run(program="this isn't even the right type of thing!")
 
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True)
-def test_run_circuit_failed(client):
-    failed_job = quantum.QuantumJob(
-        name='projects/proj/programs/prog/jobs/job-id',
-        execution_status={
-            'state': 'FAILURE',
-            'processor_name': 'myqc',
-            'failure': {'error_code': 'SYSTEM_ERROR', 'error_message': 'Not good'},
-        },
-    )
-    stream_future = duet.AwaitableFuture()
-    stream_future.try_set_result(failed_job)
-    client().run_job_over_stream.return_value = stream_future
-
-    engine = cg.Engine(project_id='proj')
-    with pytest.raises(
-        RuntimeError,
-        match='Job projects/proj/programs/prog/jobs/job-id on processor'
-        ' myqc failed. SYSTEM_ERROR: Not good',
-    ):
-        engine.run(program=_CIRCUIT)
-
-
-@mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True)
-def test_run_circuit_failed_missing_processor_name(client):
-    failed_job = quantum.QuantumJob(
-        name='projects/proj/programs/prog/jobs/job-id',
-        execution_status={
-            'state': 'FAILURE',
-            'failure': {'error_code': 'SYSTEM_ERROR', 'error_message': 'Not good'},
-        },
-    )
+@pytest.mark.parametrize(
+    'failed_job, match',
+    [
+        (
+            _job(
+                'FAILURE',
+                processor_name='myqc',
+                failure={'error_code': 'SYSTEM_ERROR', 'error_message': 'Not good'},
+            ),
+            f'Job {_JOB_NAME} on processor myqc failed. SYSTEM_ERROR: Not good',
+        ),
+        (
+            _job('FAILURE', failure={'error_code': 'SYSTEM_ERROR', 'error_message': 'Not good'}),
+            f'Job {_JOB_NAME} on processor UNKNOWN failed. SYSTEM_ERROR: Not good',
+        ),
+        (_job('CANCELLED'), f'Job {_JOB_NAME} failed in state CANCELLED.'),
+    ],
+    ids=['failed', 'failed_missing_processor_name', 'cancelled'],
+)
+def test_run_circuit_failed(engine_client, failed_job, match):
     stream_future = duet.AwaitableFuture()
     stream_future.try_set_result(failed_job)
-    client().run_job_over_stream.return_value = stream_future
-
-    engine = cg.Engine(project_id='proj')
-    with pytest.raises(
-        RuntimeError,
-        match='Job projects/proj/programs/prog/jobs/job-id on processor'
-        ' UNKNOWN failed. SYSTEM_ERROR: Not good',
-    ):
-        engine.run(program=_CIRCUIT)
-
-
-@mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True)
-def test_run_circuit_cancelled(client):
-    canceled_job = quantum.QuantumJob(
-        name='projects/proj/programs/prog/jobs/job-id', execution_status={'state': 'CANCELLED'}
-    )
-    stream_future = duet.AwaitableFuture()
-    stream_future.try_set_result(canceled_job)
-    client().run_job_over_stream.return_value = stream_future
+    engine_client().run_job_over_stream.return_value = stream_future
 
     engine = cg.Engine(project_id='proj')
-    with pytest.raises(
-        RuntimeError, match='Job projects/proj/programs/prog/jobs/job-id failed in state CANCELLED.'
-    ):
+    with pytest.raises(RuntimeError, match=match):
         engine.run(program=_CIRCUIT)
 
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True)
-def test_run_sweep_params(client):
-    setup_run_circuit_with_result_(client, _RESULTS)
+def test_run_sweep_params(engine_client, results_v1):
+    setup_run_circuit_with_result_(engine_client, results_v1)
 
     engine = cg.Engine(project_id='proj')
     job = engine.run_sweep(
@@ -470,12 +361,14 @@ def test_run_sweep_params(client):
     for i, v in enumerate([1, 2]):
         assert results[i].repetitions == 1
         assert results[i].params.param_dict == {'a': v}
-        assert results[i].measurements == {'q': np.array([[0]], dtype='uint8')}
+        assert results[i].measurements == {'q': _MEASUREMENT}
 
-    client().run_job_over_stream.assert_called_once()
+    engine_client().run_job_over_stream.assert_called_once()
 
-    run_context = v2.run_context_pb2.RunContext()
-    client().run_job_over_stream.call_args[1]['run_context'].Unpack(run_context)
+    run_context = _parse_any(
+        engine_client().run_job_over_stream.call_args[1]['run_context'],
+        v2.run_context_pb2.RunContext,
+    )
     sweeps = run_context.parameter_sweeps
     assert len(sweeps) == 2
     for i, v in enumerate([1.0, 2.0]):
@@ -483,18 +376,20 @@ def test_run_sweep_params(client):
         assert sweeps[i].sweep.sweep_function.sweeps[0].single_sweep.points.points == [v]
 
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True)
-def test_run_multiple_times(client):
-    setup_run_circuit_with_result_(client, _RESULTS)
+def test_run_multiple_times(engine_client, results_v1):
+    setup_run_circuit_with_result_(engine_client, results_v1)
 
     engine = cg.Engine(project_id='proj', proto_version=cg.engine.engine.ProtoVersion.V2)
     program = engine.create_program(program=_CIRCUIT)
     program.run(param_resolver=cirq.ParamResolver({'a': 1}))
-    run_context = v2.run_context_pb2.RunContext()
-    client().create_job_async.call_args[1]['run_context'].Unpack(run_context)
+    run_context = _parse_any(
+        engine_client().create_job_async.call_args[1]['run_context'], v2.run_context_pb2.RunContext
+    )
     sweeps1 = run_context.parameter_sweeps
     job2 = program.run_sweep(repetitions=2, params=cirq.Points('a', [3, 4]))
-    client().create_job_async.call_args[1]['run_context'].Unpack(run_context)
+    run_context = _parse_any(
+        engine_client().create_job_async.call_args[1]['run_context'], v2.run_context_pb2.RunContext
+    )
     sweeps2 = run_context.parameter_sweeps
     results = job2.results()
     assert engine.context.proto_version == cg.engine.engine.ProtoVersion.V2
@@ -502,7 +397,7 @@ def test_run_multiple_times(client):
     for i, v in enumerate([1, 2]):
         assert results[i].repetitions == 1
         assert results[i].params.param_dict == {'a': v}
-        assert results[i].measurements == {'q': np.array([[0]], dtype='uint8')}
+        assert results[i].measurements == {'q': _MEASUREMENT}
     assert len(sweeps1) == 1
     assert sweeps1[0].repetitions == 1
     points1 = sweeps1[0].sweep.sweep_function.sweeps[0].single_sweep.points
@@ -510,13 +405,12 @@ def test_run_multiple_times(client):
     assert len(sweeps2) == 1
     assert sweeps2[0].repetitions == 2
     assert sweeps2[0].sweep.single_sweep.points.points == [3, 4]
-    assert client().get_job_async.call_count == 2
-    assert client().get_job_results_async.call_count == 2
+    assert engine_client().get_job_async.call_count == 2
+    assert engine_client().get_job_results_async.call_count == 2
 
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True)
-def test_run_sweep_v2(client):
-    setup_run_circuit_with_result_(client, _RESULTS_V2)
+def test_run_sweep_v2(engine_client, results_v2):
+    setup_run_circuit_with_result_(engine_client, results_v2)
 
     engine = cg.Engine(project_id='proj', proto_version=cg.engine.engine.ProtoVersion.V2)
     job = engine.run_sweep(program=_CIRCUIT, job_id='job-id', params=cirq.Points('a', [1, 2]))
@@ -525,19 +419,20 @@ def test_run_sweep_v2(client):
     for i, v in enumerate([1, 2]):
         assert results[i].repetitions == 1
         assert results[i].params.param_dict == {'a': v}
-        assert results[i].measurements == {'q': np.array([[0]], dtype='uint8')}
-    client().run_job_over_stream.assert_called_once()
-    run_context = v2.run_context_pb2.RunContext()
-    client().run_job_over_stream.call_args[1]['run_context'].Unpack(run_context)
+        assert results[i].measurements == {'q': _MEASUREMENT}
+    engine_client().run_job_over_stream.assert_called_once()
+    run_context = _parse_any(
+        engine_client().run_job_over_stream.call_args[1]['run_context'],
+        v2.run_context_pb2.RunContext,
+    )
     sweeps = run_context.parameter_sweeps
     assert len(sweeps) == 1
     assert sweeps[0].repetitions == 1
     assert sweeps[0].sweep.single_sweep.points.points == [1, 2]
 
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True)
-def test_run_batch(client):
-    setup_run_circuit_with_result_(client, _BATCH_RESULTS_V2)
+def test_run_batch(engine_client, batch_results_v2):
+    setup_run_circuit_with_result_(engine_client, batch_results_v2)
 
     engine = cg.Engine(project_id='proj', proto_version=cg.engine.engine.ProtoVersion.V2)
     job = engine.run_batch(
@@ -551,11 +446,12 @@ def test_run_batch(client):
     for i, v in enumerate([1, 2, 3, 4]):
         assert results[i].repetitions == 1
         assert results[i].params.param_dict == {'a': v}
-        assert results[i].measurements == {'q': np.array([[0]], dtype='uint8')}
-    client().create_program_async.assert_called_once()
-    client().create_job_async.assert_called_once()
-    run_context = v2.batch_pb2.BatchRunContext()
-    client().create_job_async.call_args[1]['run_context'].Unpack(run_context)
+        assert results[i].measurements == {'q': _MEASUREMENT}
+    engine_client().create_program_async.assert_called_once()
+    engine_client().create_job_async.assert_called_once()
+    run_context = _parse_any(
+        engine_client().create_job_async.call_args[1]['run_context'], v2.batch_pb2.BatchRunContext
+    )
     assert len(run_context.run_contexts) == 2
     for idx, rc in enumerate(run_context.run_contexts):
         sweeps = rc.parameter_sweeps
@@ -565,21 +461,22 @@ def test_run_batch(client):
             assert sweeps[0].sweep.single_sweep.points.points == [1.0, 2.0]
         if idx == 1:
             assert sweeps[0].sweep.single_sweep.points.points == [3.0, 4.0]
-    client().get_job_async.assert_called_once()
-    client().get_job_results_async.assert_called_once()
+    engine_client().get_job_async.assert_called_once()
+    engine_client().get_job_results_async.assert_called_once()
+
 
+def test_run_batch_no_params(engine_client, batch_results_v2):
+    setup_run_circuit_with_result_(engine_client, batch_results_v2)
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True)
-def test_run_batch_no_params(client):
     # OK to run with no params, it should use empty sweeps for each
     # circuit.
-    setup_run_circuit_with_result_(client, _BATCH_RESULTS_V2)
     engine = cg.Engine(project_id='proj', proto_version=cg.engine.engine.ProtoVersion.V2)
     engine.run_batch(programs=[_CIRCUIT, _CIRCUIT2], job_id='job-id', processor_ids=['mysim'])
     # Validate correct number of params have been created and that they
     # are empty sweeps.
-    run_context = v2.batch_pb2.BatchRunContext()
-    client().create_job_async.call_args[1]['run_context'].Unpack(run_context)
+    run_context = _parse_any(
+        engine_client().create_job_async.call_args[1]['run_context'], v2.batch_pb2.BatchRunContext
+    )
     assert len(run_context.run_contexts) == 2
     for rc in run_context.run_contexts:
         sweeps = rc.parameter_sweeps
@@ -588,11 +485,9 @@ def test_run_batch_no_params(client):
         assert sweeps[0].sweep == v2.run_context_pb2.Sweep()
 
 
-def test_batch_size_validation_fails():
-    engine = cg.Engine(project_id='proj', proto_version=cg.engine.engine.ProtoVersion.V2)
-
+def test_batch_size_validation_fails(v2_engine):
     with pytest.raises(ValueError, match='Number of circuits and sweeps'):
-        _ = engine.run_batch(
+        _ = v2_engine.run_batch(
             programs=[_CIRCUIT, _CIRCUIT2],
             job_id='job-id',
             params_list=[
@@ -604,7 +499,7 @@ def test_batch_size_validation_fails():
         )
 
     with pytest.raises(ValueError, match='Processor id must be specified'):
-        _ = engine.run_batch(
+        _ = v2_engine.run_batch(
             programs=[_CIRCUIT, _CIRCUIT2],
             job_id='job-id',
             params_list=[cirq.Points('a', [1, 2]), cirq.Points('a', [3, 4])],
@@ -618,18 +513,11 @@ def test_bad_sweep_proto():
         program.run_sweep()
 
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True)
-def test_run_calibration(client):
-    setup_run_circuit_with_result_(client, _CALIBRATION_RESULTS_V2)
+def test_run_calibration(engine_client, calibration_results_v2):
+    setup_run_circuit_with_result_(engine_client, calibration_results_v2)
 
     engine = cg.Engine(project_id='proj', proto_version=cg.engine.engine.ProtoVersion.V2)
-    q1 = cirq.GridQubit(2, 3)
-    q2 = cirq.GridQubit(2, 4)
-    layer1 = cg.CalibrationLayer('xeb', cirq.Circuit(cirq.CZ(q1, q2)), {'num_layers': 42})
-    layer2 = cg.CalibrationLayer(
-        'readout', cirq.Circuit(cirq.measure(q1, q2)), {'num_samples': 4242}
-    )
-    job = engine.run_calibration(layers=[layer1, layer2], job_id='job-id', processor_id='mysim')
+    job = engine.run_calibration(layers=_CALIBRATION_LAYERS, job_id='job-id', processor_id='mysim')
     results = job.calibration_results()
     assert len(results) == 2
     assert results[0].code == v2.calibration_pb2.SUCCESS
@@ -637,46 +525,38 @@ def test_run_calibration(client):
     assert results[0].token == 'abc123'
     assert len(results[0].metrics) == 1
     assert len(results[0].metrics['fidelity']) == 1
-    assert results[0].metrics['fidelity'][(q1, q2)] == [0.75]
+    assert results[0].metrics['fidelity'][(_CAL_Q1, _CAL_Q2)] == [0.75]
     assert results[1].code == v2.calibration_pb2.SUCCESS
     assert results[1].error_message == 'Second success'
 
     # assert label is correct
-    client().create_job_async.assert_called_once_with(
+    engine_client().create_job_async.assert_called_once_with(
         project_id='proj',
         program_id='prog',
         job_id='job-id',
         processor_ids=['mysim'],
-        run_context=util.pack_any(v2.run_context_pb2.RunContext()),
+        run_context=_EMPTY_RUN_CONTEXT,
         description=None,
         labels={'calibration': ''},
     )
 
 
-def test_run_calibration_validation_fails():
-    engine = cg.Engine(project_id='proj', proto_version=cg.engine.engine.ProtoVersion.V2)
-    q1 = cirq.GridQubit(2, 3)
-    q2 = cirq.GridQubit(2, 4)
-    layer1 = cg.CalibrationLayer('xeb', cirq.Circuit(cirq.CZ(q1, q2)), {'num_layers': 42})
-    layer2 = cg.CalibrationLayer(
-        'readout', cirq.Circuit(cirq.measure(q1, q2)), {'num_samples': 4242}
-    )
-
+def test_run_calibration_validation_fails(v2_engine):
     with pytest.raises(ValueError, match='Processor id must be specified'):
-        _ = engine.run_calibration(layers=[layer1, layer2], job_id='job-id')
+        _ = v2_engine.run_calibration(layers=_CALIBRATION_LAYERS, job_id='job-id')
 
     with pytest.raises(ValueError, match='processor_id and processor_ids'):
-        _ = engine.run_calibration(
-            layers=[layer1, layer2], processor_ids=['mysim'], processor_id='mysim', job_id='job-id'
+        _ = v2_engine.run_calibration(
+            layers=_CALIBRATION_LAYERS,
+            processor_ids=['mysim'],
+            processor_id='mysim',
+            job_id='job-id',
         )
 
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True)
-def test_bad_result_proto(client):
-    result = any_pb2.Any()
-    result.CopyFrom(_RESULTS_V2)
-    result.type_url = 'type.googleapis.com/unknown'
-    setup_run_circuit_with_result_(client, result)
+def test_bad_result_proto(engine_client, results_v2):
+    result = _any_from_bytes('type.googleapis.com/unknown', results_v2.value)
+    setup_run_circuit_with_result_(engine_client, result)
 
     engine = cg.Engine(project_id='project-id', proto_version=cg.engine.engine.ProtoVersion.V2)
     job = engine.run_sweep(program=_CIRCUIT, job_id='job-id', params=cirq.Points('a', [1, 2]))
@@ -694,8 +574,8 @@ def test_bad_program_proto():
         engine.create_program(_CIRCUIT)
 
 
-def test_get_program():
-    assert cg.Engine(project_id='proj').get_program('prog').program_id == 'prog'
+def test_get_program(engine):
+    assert engine.get_program('prog').program_id == 'prog'
 
 
 @mock.patch('cirq_google.engine.engine_client.EngineClient.list_programs_async')
@@ -714,11 +594,10 @@ def test_list_programs(list_programs_async):
     ]
 
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True)
-def test_create_program(client):
-    client().create_program_async.return_value = ('prog', quantum.QuantumProgram())
+def test_create_program(engine_client):
+    engine_client().create_program_async.return_value = ('prog', quantum.QuantumProgram())
     result = cg.Engine(project_id='proj').create_program(_CIRCUIT, 'prog')
-    client().create_program_async.assert_called_once()
+    engine_client().create_program_async.assert_called_once()
     assert result.program_id == 'prog'
 
 
@@ -755,13 +634,12 @@ def test_list_processors(list_processors_async):
     assert [p.processor_id for p in result] == ['xmonsim', 'gmonsim']
 
 
-def test_get_processor():
-    assert cg.Engine(project_id='proj').get_processor('xmonsim').processor_id == 'xmonsim'
+def test_get_processor(engine):
+    assert engine.get_processor('xmonsim').processor_id == 'xmonsim'
 
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient', autospec=True)
-def test_sampler(client):
-    setup_run_circuit_with_result_(client, _RESULTS)
+def test_sampler(engine_client, results_v1):
+    setup_run_circuit_with_result_(engine_client, results_v1)
 
     engine = cg.Engine(project_id='proj')
     sampler = engine.get_sampler(processor_id='tmp')
@@ -772,8 +650,8 @@ def test_sampler(client):
     for i, v in enumerate([1, 2]):
         assert results[i].repetitions == 1
         assert results[i].params.param_dict == {'a': v}
-        assert results[i].measurements == {'q': np.array([[0]], dtype='uint8')}
-    assert client().run_job_over_stream.call_args[1]['project_id'] == 'proj'
+        assert results[i].measurements == {'q': _MEASUREMENT}
+    assert engine_client().run_job_over_stream.call_args[1]['project_id'] == 'proj'
 
     with cirq.testing.assert_deprecated('sampler', deadline='1.0'):
         _ = engine.sampler(processor_id='tmp')
@@ -784,95 +662,82 @@ def test_sampler(client):
 
 @mock.patch('cirq_google.cloud.quantum.QuantumEngineServiceClient')
 def test_get_engine(build):
-    # Default project id present.
-    with mock.patch('google.auth.default', lambda *args, **kwargs: (None, 'project!')):
+    with mock.patch('google.auth.default') as auth_default:
+        # Default project id present.
+        auth_default.return_value = (None, 'project!')
         eng = cirq_google.get_engine()
         assert eng.project_id == 'project!'
 
-    # Nothing present.
-    with mock.patch('google.auth.default', lambda *args, **kwargs: (None, None)):
+        # Nothing present.
+        auth_default.return_value = (None, None)
         with pytest.raises(EnvironmentError, match='GOOGLE_CLOUD_PROJECT'):
             _ = cirq_google.get_engine()
         _ = cirq_google.get_engine('project!')
 
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient.get_processor')
-def test_get_engine_device(get_processor):
-    device_spec = util.pack_any(
-        Merge(
-            """
-valid_qubits: "0_0"
-valid_qubits: "1_1"
-valid_qubits: "2_2"
-valid_targets {
-  name: "2_qubit_targets"
-  target_ordering: SYMMETRIC
-  targets {
-    ids: "0_0"
-    ids: "1_1"
-  }
-}
-valid_gates {
-  gate_duration_picos: 1000
-  cz {
-  }
-}
-valid_gates {
-  phased_xz {
-  }
-}
-""",
-            v2.device_pb2.DeviceSpecification(),
-        )
-    )
+@pytest.fixture(scope='session')
+def device_processor() -> quantum.QuantumProcessor:
+    return quantum.QuantumProcessor(device_spec=_load_any('device_spec', _DEVICE_SPEC_TYPE_URL))
+
 
-    get_processor.return_value = quantum.QuantumProcessor(device_spec=device_spec)
+_DEVICE_SPEC_QUBITS = frozenset([cirq.GridQubit(0, 0), cirq.GridQubit(1, 1), cirq.GridQubit(2, 2)])
+_DEVICE_SPEC_VALID_OPERATIONS = (
+    cirq.X(cirq.GridQubit(2, 2)),
+    cirq.CZ(cirq.GridQubit(0, 0), cirq.GridQubit(1, 1)),
+)
+# Off-device qubit, unsupported gate, and CZ on a pair that is not a valid target.
+_DEVICE_SPEC_INVALID_OPERATIONS = (
+    cirq.X(cirq.GridQubit(1, 2)),
+    cirq.H(cirq.GridQubit(0, 0)),
+    cirq.CZ(cirq.GridQubit(1, 1), cirq.GridQubit(2, 2)),
+)
+
+
+@pytest.fixture
+def client_getters():
+    """Patches the EngineClient getters used by get_engine_device/get_engine_calibration.
+
+    Yields the (get_processor, get_current_calibration) mocks. The patches are
+    undone after each test so return values do not leak between tests.
+    """
+    with mock.patch(
+        'cirq_google.engine.engine_client.EngineClient.get_processor'
+    ) as get_processor, mock.patch(
+        'cirq_google.engine.engine_client.EngineClient.get_current_calibration'
+    ) as get_current_calibration:
+        yield get_processor, get_current_calibration
+
+
+def test_get_engine_device(client_getters, device_processor):
+    get_processor, _ = client_getters
+    get_processor.return_value = device_processor
     device = cirq_google.get_engine_device('rainbow', 'project')
-    assert device.metadata.qubit_set == frozenset(
-        [cirq.GridQubit(0, 0), cirq.GridQubit(1, 1), cirq.GridQubit(2, 2)]
+    assert device.metadata.qubit_set == _DEVICE_SPEC_QUBITS
+    for operation in _DEVICE_SPEC_VALID_OPERATIONS:
+        device.validate_operation(operation)
+    for operation in _DEVICE_SPEC_INVALID_OPERATIONS:
+        with pytest.raises(ValueError):
+            device.validate_operation(operation)
+
+
+@pytest.fixture(scope='session')
+def quantum_calibration() -> quantum.QuantumCalibration:
+    return quantum.QuantumCalibration(
+        name='projects/a/processors/p/calibrations/1562715599',
+        # 2019-07-09T23:39:59Z
+        timestamp=timestamp_pb2.Timestamp(seconds=1562715599),
+        data=_load_any('metrics_snapshot', _METRICS_SNAPSHOT_TYPE_URL),
     )
-    device.validate_operation(cirq.X(cirq.GridQubit(2, 2)))
-    device.validate_operation(cirq.CZ(cirq.GridQubit(0, 0), cirq.GridQubit(1, 1)))
-    with pytest.raises(ValueError):
-        device.validate_operation(cirq.X(cirq.GridQubit(1, 2)))
-    with pytest.raises(ValueError):
-        device.validate_operation(cirq.H(cirq.GridQubit(0, 0)))
-    with pytest.raises(ValueError):
-        device.validate_operation(cirq.CZ(cirq.GridQubit(1, 1), cirq.GridQubit(2, 2)))
-
-
-_CALIBRATION = quantum.QuantumCalibration(
-    name='projects/a/processors/p/calibrations/1562715599',
-    timestamp=_to_timestamp('2019-07-09T23:39:59Z'),
-    data=util.pack_any(
-        Merge(
-            """
-    timestamp_ms: 1562544000021,
-    metrics: [
-    {
-        name: 't1',
-        targets: ['0_0'],
-        values: [{
-            double_val: 321
-        }]
-    }, {
-        name: 'globalMetric',
-        values: [{
-            int32_val: 12300
-        }]
-    }]
-""",
-            v2.metrics_pb2.MetricsSnapshot(),
-        )
-    ),
-)
 
 
-@mock.patch('cirq_google.engine.engine_client.EngineClient.get_current_calibration')
-def test_get_engine_calibration(get_current_calibration):
-    get_current_calibration.return_value = _CALIBRATION
+_CALIBRATION_METRIC_NAMES = frozenset(['t1', 'globalMetric'])
+
+
+def test_get_engine_calibration(client_getters, quantum_calibration):
+    _, get_current_calibration = client_getters
+    get_current_calibration.return_value = quantum_calibration
     calibration = cirq_google.get_engine_calibration('rainbow', 'project')
     assert calibration.timestamp == 1562544000021
-    assert set(calibration.keys()) == {'t1', 'globalMetric'}
+    assert calibration.keys() == _CALIBRATION_METRIC_NAMES
     assert calibration['t1'][(cirq.GridQubit(0, 0),)] == [321.0]
     get_current_calibration.assert_called_once_with('project', 'rainbow')
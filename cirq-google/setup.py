@@ -74,6 +74,7 @@ setup(
         'cirq_google.api.v1': ['*'],
         'cirq_google.devices.calibrations': ['*'],
         'cirq_google.devices.specifications': ['*'],
+        'cirq_google.engine': ['test_data/*.pb', 'test_data/*.textproto'],
         'cirq_google.json_test_data': ['*'],
     },
 )
@@ -22,3 +22,20 @@ def pytest_addoption(parser):
         default=False,
         help="run Rigetti integration tests",
     )
+
+
+def pytest_report_header(config):
+    # pytest only asks the rootdir conftest for report headers, so this lives
+    # here rather than next to the cirq_google tests that depend on protobuf.
+    try:
+        from google.protobuf.internal import api_implementation
+    except ImportError:
+        # coverage: ignore
+        return None
+    implementation = api_implementation.Type()
+    if implementation == 'python':
+        return (
+            'protobuf implementation: python (slow; install a protobuf wheel with the '
+            'upb or cpp extension to speed up cirq_google tests)'
+        )
+    return f'protobuf implementation: {implementation}'
@@ -0,0 +1,55 @@
+# Copyright 2023 The Cirq Developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Regenerates the binary proto fixtures used by cirq_google/engine/engine_test.py.
+
+Each `.textproto` file in cirq-google/cirq_google/engine/test_data is the
+readable source of a fixture. The tests load the matching `.pb` file, which
+holds the binary serialization of the same message, so that they do not have
+to run the text format parser.
+
+Run this script after editing a `.textproto` file:
+
+    python dev_tools/generate_engine_test_data.py
+"""
+
+import pathlib
+from typing import Dict, Type
+
+from google.protobuf import text_format
+from google.protobuf.message import Message
+
+from cirq_google.api import v1, v2
+
+TEST_DATA_DIR = (
+    pathlib.Path(__file__).parent.parent / 'cirq-google' / 'cirq_google' / 'engine' / 'test_data'
+)
+
+FIXTURE_TYPES: Dict[str, Type[Message]] = {
+    'a_result': v1.program_pb2.Result,
+    'results': v1.program_pb2.Result,
+    'device_spec': v2.device_pb2.DeviceSpecification,
+    'metrics_snapshot': v2.metrics_pb2.MetricsSnapshot,
+}
+
+
+def main():
+    for name, message_type in FIXTURE_TYPES.items():
+        text = (TEST_DATA_DIR / f'{name}.textproto').read_text()
+        message = text_format.Parse(text, message_type())
+        (TEST_DATA_DIR / f'{name}.pb').write_bytes(message.SerializeToString())
+
+
+if __name__ == '__main__':
+    main()
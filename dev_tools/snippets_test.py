@@ -54,9 +54,13 @@ In addition to checking that the code executes:
       where pattern is the regex matching pattern (passed to re.compile) and
       substitution is the replacement string.
 """
-import inspect
+import bisect
+import collections
+import functools
+import io
 import sys
-from typing import Any, Dict, List, Optional, Pattern, Tuple, Iterator
+import types
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple, Iterator
 
 import os
 import pathlib
@@ -66,6 +70,24 @@ import pytest
 
 import cirq
 
+_MARKDOWN_SNIPPET_START = '\n```python'
+_MARKDOWN_SNIPPET_END = '\n```\n'
+_MARKDOWN_OVERRIDE_PATTERN = re.compile(
+    "<!---test_substitution\n(.*?)--->", re.MULTILINE | re.DOTALL
+)
+_RST_SNIPPET_PATTERN = re.compile(
+    r'\n.. code-block:: python\n(?:\s+:.*?\n)*\n(.*?)(?:\n\S|\Z)', re.MULTILINE | re.DOTALL
+)
+_RST_OVERRIDE_PATTERN = re.compile(
+    r'.. test-substitution::\n(([^\n]*\n){2})', re.MULTILINE | re.DOTALL
+)
+_NEWLINE_PATTERN = re.compile("\n")
+_NON_EMPTY_LINE_PATTERN = re.compile(r'\s*\S')
+_LEADING_WHITESPACE_PATTERN = re.compile(r'\s*')
+_RAISES_PATTERN = re.compile(r"# raises\s*(\S*)")
+_PRINTS_PATTERN = re.compile(r'^#\s*prints?:?\s*$')
+_PRINTED_ARRAY_PATTERN = re.compile(r"\[([^\]]+\.[^\]]*)\]")
+
 
 def test_can_run_readme_code_snippets():
     # Get the contents of the README.md file at the project root.
@@ -83,32 +105,53 @@ def find_docs_code_snippets_paths() -> Iterator[str]:
         yield str(filename.relative_to(docs_folder))
 
 
-@pytest.mark.parametrize('path', find_docs_code_snippets_paths())
+# Sorted so that every pytest-xdist worker collects the files in the same order.
+@pytest.mark.parametrize('path', sorted(find_docs_code_snippets_paths()))
 def test_can_run_docs_code_snippets(path):
     docs_folder = os.path.dirname(__file__)
     assert_file_has_working_code_snippets(os.path.join(docs_folder, path), assume_import=True)
 
 
-def find_code_snippets(pattern: str, content: str) -> List[Tuple[str, int]]:
-    matches = re.finditer(pattern, content, re.MULTILINE | re.DOTALL)
-    newlines = re.finditer("\n", content)
-    snippets = []
+def iter_code_snippets(pattern: Pattern, content: str) -> Iterator[Tuple[str, int]]:
+    matches = pattern.finditer(content)
+    newlines = _NEWLINE_PATTERN.finditer(content)
     current_line = 1
     for match in matches:
         for newline in newlines:
             current_line += 1
             if newline.start() >= match.start():
-                snippets.append((match.group(1), current_line))
+                yield match.group(1), current_line
                 break
-    return snippets
+
+
+def find_code_snippets(pattern: Pattern, content: str) -> List[Tuple[str, int]]:
+    return list(iter_code_snippets(pattern, content))
+
+
+def iter_markdown_code_snippets(content: str) -> Iterator[Tuple[str, int]]:
+    # Markdown fences are fixed literals, so a linear scan with str.find is
+    # enough and avoids running a DOTALL regex over the whole document.
+    current_line = 1
+    scanned = 0
+    start = content.find(_MARKDOWN_SNIPPET_START)
+    while start != -1:
+        body_start = start + len(_MARKDOWN_SNIPPET_START)
+        end = content.find(_MARKDOWN_SNIPPET_END, body_start)
+        if end == -1:
+            break
+        # Report the line of the opening fence, like find_code_snippets does.
+        current_line += content.count('\n', scanned, start + 1)
+        scanned = start + 1
+        yield content[body_start:end], current_line
+        start = content.find(_MARKDOWN_SNIPPET_START, end + len(_MARKDOWN_SNIPPET_END))
 
 
 def find_markdown_code_snippets(content: str) -> List[Tuple[str, int]]:
-    return find_code_snippets("\n```python(.*?)\n```\n", content)
+    return list(iter_markdown_code_snippets(content))
 
 
 def find_markdown_test_overrides(content: str) -> List[Tuple[Pattern, str]]:
-    test_sub_text = find_code_snippets("<!---test_substitution\n(.*?)--->", content)
+    test_sub_text = find_code_snippets(_MARKDOWN_OVERRIDE_PATTERN, content)
     substitutions = [line.split('\n')[:-1] for line, _ in test_sub_text]
     return [(re.compile(match), sub) for match, sub in substitutions]
 
@@ -116,7 +159,7 @@ def find_markdown_test_overrides(content: str) -> List[Tuple[Pattern, str]]:
 def apply_overrides(content: str, overrides: List[Tuple[Pattern, str]]) -> str:
     override_content = content
     for pattern, sub in overrides:
-        override_content = re.sub(pattern, sub, override_content)
+        override_content = pattern.sub(sub, override_content)
     return override_content
 
 
@@ -126,8 +169,8 @@ def deindent_snippet(snippet: str) -> str:
 
     for line in snippet.split('\n'):
         # The first non-empty line determines the indentation level.
-        if indentation_amount is None and re.match(r'\s*\S', line):
-            leading_whitespace = re.match(r'\s*', line)
+        if indentation_amount is None and _NON_EMPTY_LINE_PATTERN.match(line):
+            leading_whitespace = _LEADING_WHITESPACE_PATTERN.match(line)
             if leading_whitespace:
                 indentation_amount = len(leading_whitespace.group(0))
 
@@ -138,16 +181,18 @@ def deindent_snippet(snippet: str) -> str:
     return '\n'.join(deindented_lines)
 
 
+def iter_rst_code_snippets(content: str) -> Iterator[Tuple[str, int]]:
+    for snippet, line_number in iter_code_snippets(_RST_SNIPPET_PATTERN, content):
+        yield deindent_snippet(snippet), line_number
+
+
 def find_rst_code_snippets(content: str) -> List[Tuple[str, int]]:
-    snippets = find_code_snippets(
-        r'\n.. code-block:: python\n(?:\s+:.*?\n)*\n(.*?)(?:\n\S|\Z)', content
-    )
-    return [(deindent_snippet(content), line_number) for content, line_number in snippets]
+    return list(iter_rst_code_snippets(content))
 
 
 def find_rst_test_overrides(content: str) -> List[Tuple[Pattern, str]]:
     # Find ".. test-substitution::"
-    test_sub_text = find_code_snippets(r'.. test-substitution::\n(([^\n]*\n){2})', content)
+    test_sub_text = find_code_snippets(_RST_OVERRIDE_PATTERN, content)
     substitutions = [line.split('\n')[:-1] for line, _ in test_sub_text]
     return [(re.compile(match.lstrip()), sub.lstrip()) for match, sub in substitutions]
 
@@ -348,38 +393,53 @@ universe
     )
 
 
+@functools.lru_cache(maxsize=128)
+def _read_file(path: str, mtime_ns: int) -> str:
+    """Reads a file, keyed on its modification time so that edits are picked up."""
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
 def assert_file_has_working_code_snippets(path: str, assume_import: bool):
     """Checks that code snippets in a file actually run."""
 
-    with open(path, encoding='utf-8') as f:
-        content = f.read()
+    content = _read_file(path, os.stat(path).st_mtime_ns)
 
-    # Find snippets of code, and execute them. They should finish.
+    # Find snippets of code, and execute them as they are found. They should finish.
     if path.endswith('.md'):
         overrides = find_markdown_test_overrides(content)
         content = apply_overrides(content, overrides)
-        snippets = find_markdown_code_snippets(content)
+        snippets = iter_markdown_code_snippets(content)
     else:
         overrides = find_rst_test_overrides(content)
         content = apply_overrides(content, overrides)
-        snippets = find_rst_code_snippets(content)
-    assert_code_snippets_run_in_sequence(snippets, assume_import)
+        snippets = iter_rst_code_snippets(content)
+    assert_code_snippets_run_in_sequence(snippets, assume_import, path)
 
 
-def assert_code_snippets_run_in_sequence(snippets: List[Tuple[str, int]], assume_import: bool):
+def assert_code_snippets_run_in_sequence(
+    snippets: Iterable[Tuple[str, int]], assume_import: bool, filename: str = 'snippet'
+):
     """Checks that a sequence of code snippets actually run.
 
     State is kept between snippets. Imports and variables defined in one
     snippet will be visible in later snippets.
+
+    Each snippet is compiled under the name `<filename:line>`. Line numbers in
+    its tracebacks count from the start of the snippet, so the name must not
+    resolve to the real file, or linecache would show unrelated lines from it.
     """
 
     state: Dict[str, Any] = {}
 
     if assume_import:
-        exec('import cirq', state)
+        # cirq is already imported by this module, so bind it directly.
+        state['cirq'] = cirq
 
     for content, line_number in snippets:
-        assert_code_snippet_executes_correctly(content, state, line_number)
+        assert_code_snippet_executes_correctly(
+            content, state, line_number, f'<{filename}:{line_number}>'
+        )
 
 
 def _canonicalize_printed_line_chunk(chunk: str) -> str:
@@ -436,7 +496,7 @@ def canonicalize_printed_line(line: str) -> str:
     """
     prev_end = 0
     result = []
-    for match in re.finditer(r"\[([^\]]+\.[^\]]*)\]", line):
+    for match in _PRINTED_ARRAY_PATTERN.finditer(line):
         start = match.start() + 1
         end = match.end() - 1
         result.append(line[prev_end:start])
@@ -464,11 +524,16 @@ def test_canonicalize_printed_line():
 
 
 def assert_code_snippet_executes_correctly(
-    snippet: str, state: Dict, line_number: Optional[int] = None
+    snippet: str, state: Dict, line_number: Optional[int] = None, filename: str = '<snippet>'
 ):
     """Executes a snippet and compares output / errors to annotations."""
 
-    raises_annotation = re.search(r"# raises\s*(\S*)", snippet)
+    if '# raises' not in snippet:
+        # Most snippets have no failure annotation; skip the regex search.
+        assert_code_snippet_runs_and_prints_expected(snippet, state, line_number, filename)
+        return
+
+    raises_annotation = _RAISES_PATTERN.search(snippet)
     if raises_annotation is None:
         before = snippet
         after = None
@@ -480,26 +545,35 @@ def assert_code_snippet_executes_correctly(
         if not expected_failure:
             raise AssertionError('No error type specified for # raises line.')
 
-    assert_code_snippet_runs_and_prints_expected(before, state, line_number)
+    assert_code_snippet_runs_and_prints_expected(before, state, line_number, filename)
     if expected_failure is not None:
         assert after is not None
-        assert_code_snippet_fails(after, state, expected_failure)
+        assert_code_snippet_fails(after, state, expected_failure, filename)
+
+
+@functools.lru_cache(maxsize=2048)
+def _compile_snippet(snippet: str, filename: str) -> types.CodeType:
+    """Compiles a snippet, reusing the code object when the same snippet is run again."""
+    return compile(snippet, filename, 'exec')
 
 
 def assert_code_snippet_runs_and_prints_expected(
-    snippet: str, state: Dict, line_number: Optional[int] = None
+    snippet: str, state: Dict, line_number: Optional[int] = None, filename: str = '<snippet>'
 ):
     """Executes a snippet and compares captured output to annotated output."""
-    output_lines: List[str] = []
+    output = io.StringIO()
     expected_outputs = find_expected_outputs(snippet)
 
     def print_capture(*values, sep=' '):
-        output_lines.extend(sep.join(str(e) for e in values).split('\n'))
+        output.write(sep.join(str(e) for e in values))
+        output.write('\n')
 
     state['print'] = print_capture
     try:
-        exec(snippet, state)
+        exec(_compile_snippet(snippet, filename), state)
 
+        # Every print ends with a newline, so drop the empty string after the last one.
+        output_lines = output.getvalue().split('\n')[:-1]
         assert_expected_lines_present_in_order(expected_outputs, output_lines)
     except AssertionError as ex:
         # pylint: disable=consider-using-f-string
@@ -510,19 +584,24 @@ def assert_code_snippet_runs_and_prints_expected(
         raise
 
 
-def assert_code_snippet_fails(snippet: str, state: Dict, expected_failure_type: str):
+def assert_code_snippet_fails(
+    snippet: str, state: Dict, expected_failure_type: str, filename: str = '<snippet>'
+):
     try:
-        exec(snippet, state)
+        exec(_compile_snippet(snippet, filename), state)
     except Exception as ex:
-        actual_failure_types = [e.__name__ for e in inspect.getmro(type(ex))]
-        if expected_failure_type not in actual_failure_types:
-            # pylint: disable=consider-using-f-string
-            raise AssertionError(
-                'Expected snippet to raise a {}, but it raised a {}.'.format(
-                    expected_failure_type, ' -> '.join(actual_failure_types)
-                )
+        failure_type = type(ex)
+        # Usually the exact exception type is annotated, so check it before the base classes.
+        if failure_type.__name__ == expected_failure_type:
+            return
+        if any(e.__name__ == expected_failure_type for e in failure_type.__mro__):
+            return
+        # pylint: disable=consider-using-f-string
+        raise AssertionError(
+            'Expected snippet to raise a {}, but it raised a {}.'.format(
+                expected_failure_type, ' -> '.join(e.__name__ for e in failure_type.__mro__)
             )
-        return
+        )
 
     raise AssertionError('Expected snippet to fail, but it ran to completion.')
 
@@ -535,10 +614,17 @@ def assert_expected_lines_present_in_order(expected_lines: List[str], actual_lin
     expected_lines = [canonicalize_printed_line(e) for e in expected_lines]
     actual_lines = [canonicalize_printed_line(e) for e in actual_lines]
 
+    # Positions of each distinct actual line, in increasing order, so the next
+    # occurrence of an expected line can be found by bisection.
+    line_indices: Dict[str, List[int]] = collections.defaultdict(list)
+    for index, line in enumerate(actual_lines):
+        line_indices[line].append(index)
+
     i = 0
     for expected in expected_lines:
-        while i < len(actual_lines) and actual_lines[i] != expected:
-            i += 1
+        indices = line_indices.get(expected, [])
+        k = bisect.bisect_left(indices, i)
+        i = indices[k] if k < len(indices) else len(actual_lines)
 
         assert i < len(actual_lines), (
             'Missing expected line: {!r}\n'
@@ -580,18 +666,21 @@ def find_expected_outputs(snippet: str) -> List[str]:
     '# prints something like' to avoid checking the following lines.
     """
     continue_key = '# '
+    bare_continue_key = continue_key.strip()
+    continue_key_length = len(continue_key)
     expected = []
 
     printing = False
-    for line in snippet.split('\n'):
+    for line in snippet.splitlines():
         if printing:
-            if line.startswith(continue_key) or line == continue_key.strip():
-                rest = line[len(continue_key) :]
+            if line[:continue_key_length] == continue_key or line == bare_continue_key:
+                rest = line[continue_key_length:]
                 expected.append(rest)
             else:
                 printing = False
-        # Matches '# print', '# prints', '# print:', and '# prints:'
-        elif re.match(r'^#\s*prints?:?\s*$', line):
+        # Matches '# print', '# prints', '# print:', and '# prints:'. Most lines
+        # are not comments, so reject those before running the regex.
+        elif line[:1] == '#' and _PRINTS_PATTERN.match(line):
             printing = True
 
     return expected